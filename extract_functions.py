@@ -3,56 +3,125 @@
 
 import ast
 import csv
+import functools
+import io
+import itertools
 import sys
 
-def extract_functions(source_path, csv_path):
+# Rows are handed to the CSV writer in batches of this size
+CSV_BATCH_SIZE = 1024
+
+
+class FunctionCollector(ast.NodeVisitor):
+    # Collects function definitions in source order. Descends into classes
+    # (so methods are found) but not into function bodies, so nested
+    # helpers are reported as part of their enclosing function.
+    def __init__(self):
+        self.functions = []
+
+    def visit_FunctionDef(self, node):
+        self.functions.append(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.generic_visit(node)
+
+
+def write_csv_rows(out_csv, rows):
+    # Writes rows as CSV with every field quoted (the same output as
+    # csv.writer with QUOTE_ALL). The fields here only ever need their
+    # quotes doubled, so formatting them directly into one buffer skips the
+    # csv module's per-field quoting logic.
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('"')
+        buf.write('","'.join(field.replace('"', '""') for field in row))
+        buf.write('"\r\n')
+    out_csv.write(buf.getvalue())
+
+
+def extract_functions(source_path, csv_path, verbose=False, safe=False):
     # Read source code
     with open(source_path, "r", encoding="utf-8") as f:
-        source_lines = f.readlines()
-        source_code = "".join(source_lines)
+        source_code = f.read()
+
+    # Offsets of the start of every line, so function bodies can be sliced
+    # straight out of source_code. Text mode already normalised newlines to
+    # "\n", which matches how ast counts lines.
+    line_offsets = [0]
+    pos = source_code.find("\n")
+    while pos != -1:
+        line_offsets.append(pos + 1)
+        pos = source_code.find("\n", pos + 1)
+    line_offsets.append(len(source_code))
 
     # Parse AST
     tree = ast.parse(source_code)
 
-    # Prepare output CSV
-    with open(csv_path, mode="w", newline="", encoding="utf-8") as out_csv:
-        writer = csv.writer(out_csv)
+    # Prepare output CSV (1 MiB buffer, no write-through, so rows reach the
+    # disk in large chunks rather than one syscall per row)
+    raw_csv = open(csv_path, mode="wb", buffering=1 << 20)
+    with io.TextIOWrapper(raw_csv, encoding="utf-8", newline="", write_through=False) as out_csv:
+        # Rows are formatted by write_csv_rows, or by the csv module when
+        # safe is set (with the same quoting, so the two outputs can be
+        # compared byte for byte)
+        if safe:
+            write_rows = csv.writer(out_csv, quoting=csv.QUOTE_ALL).writerows
+        else:
+            write_rows = functools.partial(write_csv_rows, out_csv)
+
         # Optional header row
-        writer.writerow(["function_signature", "source_code"])
-
-        # Walk through AST, find function definitions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Function name & argument list
-                func_name = node.name
-                arg_names = []
-                # Positional args
-                for arg in node.args.args:
-                    arg_names.append(arg.arg)
-                # *args
-                if node.args.vararg:
-                    arg_names.append("*" + node.args.vararg.arg)
-                # Keyword-only args
-                for arg in node.args.kwonlyargs:
-                    arg_names.append(arg.arg + "=?")
-                # **kwargs
-                if node.args.kwarg:
-                    arg_names.append("**" + node.args.kwarg.arg)
-
-                function_signature = f"{func_name}({', '.join(arg_names)})"
-
-                # Extract source code for lines [lineno-1 : end_lineno]
-                start = node.lineno - 1
-                end = node.end_lineno
-                func_src = "".join(source_lines[start:end])
-                print(f"{end-start+1} lines in {func_name}")
-
-                # Write to CSV
-                writer.writerow([function_signature, func_src])
+        write_rows([("function_signature", "source_code")])
+
+        rows = []
+        messages = []
+        count = 0
+
+        # Find function definitions
+        collector = FunctionCollector()
+        collector.visit(tree)
+        for node in collector.functions:
+            # Function name & argument list: positional (including
+            # positional-only), *args, keyword-only, **kwargs
+            args = node.args
+            arg_names = itertools.chain(
+                (arg.arg for arg in args.posonlyargs),
+                (arg.arg for arg in args.args),
+                (f"*{args.vararg.arg}",) if args.vararg else (),
+                (f"{arg.arg}=?" for arg in args.kwonlyargs),
+                (f"**{args.kwarg.arg}",) if args.kwarg else (),
+            )
+            func_name = node.name
+            function_signature = f"{func_name}({', '.join(arg_names)})"
+
+            # Extract source code for lines [lineno-1 : end_lineno]
+            start = node.lineno - 1
+            end = node.end_lineno
+            func_src = source_code[line_offsets[start]:line_offsets[end]]
+            count += 1
+            if verbose:
+                messages.append(f"{end-start+1} lines in {func_name}")
+
+            # Queue for CSV, writing out a batch once enough have accumulated
+            rows.append((function_signature, func_src))
+            if len(rows) >= CSV_BATCH_SIZE:
+                write_rows(rows)
+                rows.clear()
+
+        write_rows(rows)
+
+    # Report once the CSV is closed, in a single write
+    if verbose:
+        messages.append("")
+        sys.stdout.write("\n".join(messages))
+    print(f"{count} functions written to {csv_path}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python extract_functions.py <source_file.py> <output.csv>")
+    flags = {"--verbose", "--safe"}
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+    if len(args) < 2:
+        print("Usage: python extract_functions.py [--verbose] [--safe] <source_file.py> <output.csv>")
         sys.exit(1)
-    extract_functions(sys.argv[1], sys.argv[2])
+    extract_functions(args[0], args[1], verbose="--verbose" in sys.argv[1:], safe="--safe" in sys.argv[1:])
@@ -5,16 +5,25 @@ Creates both function-level and class-level call graphs in interactive HTML form
 
 import os
 import sys
+import ast
 import json
-import subprocess
+import array
+import importlib
 import networkx as nx
 from pyvis.network import Network
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # Repository directory
 REPO_DIR = "/home/ubuntu/projects/head-pose-estimation-and-face-landmark"
+# Prefix of pycg names that belong to the repository (anything else is external)
+_REPO_PREFIX = REPO_DIR.replace('/home/ubuntu/', '')
 # Output directory
 OUTPUT_DIR = "/home/ubuntu/call_graphs"
+# Number of pycg passes over the source code. A single pass is much faster
+# on large repositories; -1 iterates to a fix point for the most complete graph.
+PYCG_MAX_ITER = 1
 
 # Create output directory if it doesn't exist
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -28,134 +37,403 @@ python_files = [
     "/home/ubuntu/projects/head-pose-estimation-and-face-landmark/librect.py"
 ]
 
+# PyVis display options, parsed once and shared by every graph.
+# (Network.set_options would re-parse the JSON string for each graph.)
+PYVIS_OPTIONS = json.loads("""
+{
+    "nodes": {
+        "shape": "dot",
+        "size": 20,
+        "font": {
+            "size": 14,
+            "face": "Tahoma"
+        }
+    },
+    "edges": {
+        "color": {
+            "inherit": true
+        },
+        "smooth": {
+            "type": "continuous"
+        }
+    },
+    "physics": {
+        "barnesHut": {
+            "gravitationalConstant": -80000,
+            "centralGravity": 0.3,
+            "springLength": 95,
+            "springConstant": 0.04
+        },
+        "maxVelocity": 50,
+        "minVelocity": 0.1,
+        "solver": "barnesHut",
+        "stabilization": {
+            "enabled": true,
+            "iterations": 1000,
+            "updateInterval": 100
+        }
+    }
+}
+""")
+
+class CallGraph:
+    """
+    Compact directed graph used for the pycg call graphs.
+    
+    Node names are interned to integer ids, node attributes are stored as
+    parallel lists indexed by id, and edges are kept as a flat int32 array of
+    (source_id, target_id) pairs. This is far smaller than a NetworkX DiGraph,
+    which keeps nested dicts for every node and edge. It exposes the same
+    nodes(data=True) / edges() iteration that create_interactive_graph relies
+    on, and can be turned into a NetworkX graph with to_networkx() when needed.
+    """
+    
+    ATTRS = ('label', 'title', 'group')
+    
+    def __init__(self):
+        self.id_of = {}
+        self.names = []
+        self.node_attrs = {attr: [] for attr in self.ATTRS}
+        self.edge_ids = array.array('i')
+        self._edge_keys = set()
+    
+    def add_node(self, name, label=None, title=None, group=''):
+        """
+        Add a node if it isn't already present.
+        
+        Args:
+            name: Node name
+            label, title, group: Display attributes for the node
+        
+        Returns:
+            Integer id of the node
+        """
+        node_id = self.id_of.get(name)
+        if node_id is None:
+            node_id = len(self.names)
+            self.id_of[name] = node_id
+            self.names.append(name)
+            self.node_attrs['label'].append(name if label is None else label)
+            self.node_attrs['title'].append(name if title is None else title)
+            self.node_attrs['group'].append(group)
+        return node_id
+    
+    def has_node(self, name):
+        return name in self.id_of
+    
+    def add_edge(self, source, target):
+        """
+        Add an edge between two nodes, adding the nodes if they are missing.
+        Duplicate edges are ignored.
+        """
+        source_id = self.add_node(source)
+        target_id = self.add_node(target)
+        key = (source_id << 32) | target_id
+        if key not in self._edge_keys:
+            self._edge_keys.add(key)
+            self.edge_ids.append(source_id)
+            self.edge_ids.append(target_id)
+    
+    def number_of_nodes(self):
+        return len(self.names)
+    
+    def number_of_edges(self):
+        return len(self.edge_ids) // 2
+    
+    def nodes(self, data=False):
+        """
+        List node names, or (name, attrs) pairs if data is True.
+        """
+        if not data:
+            return list(self.names)
+        labels, titles, groups = (self.node_attrs[attr] for attr in self.ATTRS)
+        return [
+            (name, {'label': labels[i], 'title': titles[i], 'group': groups[i]})
+            for i, name in enumerate(self.names)
+        ]
+    
+    def edges(self):
+        """
+        Iterate over edges as (source_name, target_name) pairs.
+        """
+        names = self.names
+        ids = self.edge_ids
+        for i in range(0, len(ids), 2):
+            yield names[ids[i]], names[ids[i + 1]]
+    
+    def to_networkx(self):
+        """
+        Materialize the graph as a NetworkX DiGraph.
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes(data=True))
+        G.add_edges_from(self.edges())
+        return G
+    
+    def to_igraph(self):
+        """
+        Materialize the graph as an igraph Graph (requires python-igraph).
+        
+        igraph wants contiguous integer vertex ids, which are exactly the
+        interned ids, so the edge array is handed over without remapping.
+        """
+        import igraph
+        
+        ids = self.edge_ids
+        vertex_attrs = {'name': self.names}
+        vertex_attrs.update(self.node_attrs)
+        return igraph.Graph(
+            n=len(self.names),
+            edges=list(zip(ids[0::2], ids[1::2])),
+            directed=True,
+            vertex_attrs=vertex_attrs,
+        )
+
+# Graph representations the pycg extractors can return:
+# - "compact": CallGraph (default, smallest)
+# - "networkx": nx.DiGraph, for use with NetworkX algorithms
+# - "igraph": igraph.Graph, far less memory than NetworkX and fast
+#   adjacency iteration, but python-igraph must be installed
+GRAPH_BACKENDS = ('compact', 'networkx', 'igraph')
+
+def _make_graph(G, backend):
+    """
+    Convert a CallGraph to the requested backend's representation.
+    
+    Args:
+        G: CallGraph
+        backend: One of GRAPH_BACKENDS
+    
+    Returns:
+        Graph in the requested representation
+    """
+    if backend == 'compact':
+        return G
+    if backend == 'networkx':
+        return G.to_networkx()
+    if backend == 'igraph':
+        return G.to_igraph()
+    raise ValueError(f"Unknown graph backend {backend!r}, expected one of {GRAPH_BACKENDS}")
+
+def _graph_nodes(G):
+    """
+    Iterate over (node, attrs) pairs of a CallGraph, NetworkX or igraph graph.
+    """
+    if hasattr(G, 'vs'):  # igraph
+        for vertex in G.vs:
+            yield vertex['name'], vertex.attributes()
+    else:
+        yield from G.nodes(data=True)
+
+def _graph_edges(G):
+    """
+    Iterate over (source, target) node pairs of a CallGraph, NetworkX or
+    igraph graph.
+    """
+    if hasattr(G, 'vs'):  # igraph
+        names = G.vs['name']
+        for source, target in G.get_edgelist():
+            yield names[source], names[target]
+    else:
+        yield from G.edges()
+
 def generate_call_graph_data(files):
     """
     Generate call graph data using pycg.
     
+    pycg runs in this process, so there is no interpreter start-up for a
+    subprocess and no round trip through a JSON file on disk.
+    
     Args:
         files: List of Python files to analyze
     
     Returns:
-        Call graph data in JSON format
+        Call graph data as a dict of function name to list of called
+        function names, or None on error
     """
-    # Define the output JSON file
-    output_json = os.path.join(OUTPUT_DIR, "call_graph.json")
-    
-    # Define the command to run pycg
-    cmd = [
-        "pycg",
-        "--package", REPO_DIR,
-        "-o", output_json
-    ] + files
+    # pycg installs an import hook and puts the package on sys.path for each
+    # pass, but only removes them when the pass succeeds. Save the import
+    # state so it can always be restored; otherwise a failed analysis leaves
+    # every later import in this process going through pycg's loader.
+    saved_path = list(sys.path)
+    saved_path_hooks = list(sys.path_hooks)
     
-    # Run pycg and capture the output
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Imported here so a missing or broken pycg is reported like any
+        # other pycg failure, leaving the AST-based fallback usable
+        from pycg import formats
+        from pycg.pycg import CallGraphGenerator
+        from pycg.utils.constants import CALL_GRAPH_OP
         
-        # Read the generated JSON file
-        with open(output_json, 'r') as f:
-            call_graph_data = json.load(f)
+        cg = CallGraphGenerator(files, REPO_DIR, PYCG_MAX_ITER, CALL_GRAPH_OP)
+        try:
+            cg.analyze()
+        finally:
+            if cg.import_manager.old_path_hooks is not None:
+                cg.tearDown()
+            sys.path[:] = saved_path
+            sys.path_hooks[:] = saved_path_hooks
+            sys.path_importer_cache.clear()
+            importlib.invalidate_caches()
         
-        return call_graph_data
-    except subprocess.CalledProcessError as e:
-        print(f"Error generating call graph: {e}")
-        print(f"Error output: {e.stderr}")
-        return None
+        return formats.Simple(cg).generate()
     except Exception as e:
-        print(f"Error processing call graph data: {e}")
+        print(f"Error generating call graph: {e}")
         return None
 
-def extract_function_calls(call_graph_data):
+def make_is_internal():
+    """
+    Create a check for whether a pycg name refers to code in the repository.
+    
+    The same names (especially heavily used library functions) recur
+    throughout the pycg output, so results are memoized and a dict hit
+    replaces most prefix comparisons. Each extraction makes its own check,
+    so the memo is freed when the extraction finishes.
+    
+    Returns:
+        Function taking a dotted pycg name and returning True if it starts
+        with the repository prefix
+    """
+    cache = {}
+    
+    def is_internal(name):
+        result = cache.get(name)
+        if result is None:
+            result = name.startswith(_REPO_PREFIX)
+            cache[name] = result
+        return result
+    
+    return is_internal
+
+def iter_call_graph(call_graph_data):
+    """
+    Iterate over (function, calls) pairs of a pycg call graph.
+    
+    A saved pycg JSON file is streamed with ijson, so only one entry is held
+    in memory at a time instead of loading the whole call graph (which can be
+    hundreds of MB) with json.load. ijson is only needed (and imported) for
+    that case.
+    
+    Args:
+        call_graph_data: Call graph dict from generate_call_graph_data, or
+            path to a pycg JSON output file
+    
+    Yields:
+        Tuples of (function name, list of called function names)
+    """
+    if isinstance(call_graph_data, dict):
+        yield from call_graph_data.items()
+        return
+    
+    import ijson
+    
+    with open(call_graph_data, 'rb') as f:
+        yield from ijson.kvitems(f, '')
+
+def extract_function_calls(call_graph_data, backend='compact'):
     """
     Extract function-level call graph from the pycg output.
     
     Args:
-        call_graph_data: Call graph data from pycg
+        call_graph_data: Call graph dict from generate_call_graph_data, or
+            path to a pycg JSON output file
+        backend: Graph representation to return, one of GRAPH_BACKENDS
     
     Returns:
-        NetworkX graph of function calls
+        Graph of function calls (a CallGraph unless another backend is chosen)
     """
-    G = nx.DiGraph()
+    G = CallGraph()
+    is_internal = make_is_internal()
     
     # Process each function and its calls
-    for func, calls in call_graph_data.items():
+    for func, calls in iter_call_graph(call_graph_data):
         # Skip external libraries
-        if not func.startswith(REPO_DIR.replace('/home/ubuntu/', '')):
+        if not is_internal(func):
             continue
             
-        # Clean up function name for display
-        display_name = func.split('.')[-1]
-        module_name = '.'.join(func.split('.')[:-1])
-        
-        # Add the function node
-        G.add_node(func, label=display_name, title=func, group=module_name)
+        # Add the function node, splitting off the name for display only
+        # the first time it is seen (it may already be a call target)
+        if not G.has_node(func):
+            module_name, _, display_name = func.rpartition('.')
+            G.add_node(func, label=display_name, title=func, group=module_name)
         
         # Add edges for each call
         for call in calls:
             # Skip external libraries
-            if not call.startswith(REPO_DIR.replace('/home/ubuntu/', '')):
+            if not is_internal(call):
                 continue
                 
-            # Clean up call name for display
-            call_display = call.split('.')[-1]
-            call_module = '.'.join(call.split('.')[:-1])
-            
-            # Add the call node
-            G.add_node(call, label=call_display, title=call, group=call_module)
+            # Add the call node if it doesn't exist
+            if not G.has_node(call):
+                call_module, _, call_display = call.rpartition('.')
+                G.add_node(call, label=call_display, title=call, group=call_module)
             
             # Add the edge
             G.add_edge(func, call)
     
-    return G
+    return _make_graph(G, backend)
 
-def extract_class_calls(call_graph_data):
+def extract_class_calls(call_graph_data, backend='compact'):
     """
     Extract class-level call graph from the pycg output.
     
     Args:
-        call_graph_data: Call graph data from pycg
+        call_graph_data: Call graph dict from generate_call_graph_data, or
+            path to a pycg JSON output file
+        backend: Graph representation to return, one of GRAPH_BACKENDS
     
     Returns:
-        NetworkX graph of class calls
+        Graph of class calls (a CallGraph unless another backend is chosen)
     """
-    G = nx.DiGraph()
+    G = CallGraph()
+    is_internal = make_is_internal()
     
     # Map to store function to class mapping
     func_to_class = {}
     
-    # First pass: identify classes and their methods
-    for func in call_graph_data.keys():
+    # Calls to repository functions not seen yet, keyed by the called
+    # function: the classes waiting on it for an edge
+    pending = defaultdict(list)
+    
+    # Single pass: register each method's class, resolving edges as soon as
+    # both ends are known. Names are interned so that the many repeated
+    # copies streamed from the JSON share one string object, and the dict
+    # lookups below compare by identity instead of by content.
+    for func, calls in iter_call_graph(call_graph_data):
         # Skip external libraries
-        if not func.startswith(REPO_DIR.replace('/home/ubuntu/', '')):
+        if not is_internal(func):
             continue
             
+        func = sys.intern(func)
+        
         # Check if this is a class method (contains a class name)
-        parts = func.split('.')
-        if len(parts) >= 3:  # module.class.method
-            class_name = '.'.join(parts[:-1])  # module.class
-            func_to_class[func] = class_name
-            
-            # Add the class node if it doesn't exist
-            if not G.has_node(class_name):
-                display_name = parts[-2]  # class name
-                module_name = '.'.join(parts[:-2])  # module
-                G.add_node(class_name, label=display_name, title=class_name, group=module_name)
-    
-    # Second pass: add edges between classes
-    for func, calls in call_graph_data.items():
-        # Skip if not a class method or external
-        if func not in func_to_class:
+        class_name = sys.intern(func.rpartition('.')[0])  # module.class
+        module_name, sep, display_name = class_name.rpartition('.')  # module, class
+        if not sep:  # not module.class.method
             continue
             
-        source_class = func_to_class[func]
+        source_class = class_name
+        func_to_class[func] = source_class
+        
+        # Add the class node if it doesn't exist
+        if not G.has_node(source_class):
+            G.add_node(source_class, label=display_name, title=source_class, group=module_name)
+        
+        # Add edges from callers that reached this method before it was seen
+        for caller_class in pending.pop(func, ()):
+            # Skip self-calls within the same class
+            if caller_class != source_class:
+                G.add_edge(caller_class, source_class)
         
         for call in calls:
-            # Skip external calls
-            if call not in func_to_class:
+            call = sys.intern(call)
+            target_class = func_to_class.get(call)
+            if target_class is None:
+                # Not seen yet; only repository functions can resolve later
+                if is_internal(call):
+                    pending[call].append(source_class)
                 continue
                 
-            target_class = func_to_class[call]
-            
             # Skip self-calls within the same class
             if source_class == target_class:
                 continue
@@ -163,64 +441,32 @@ def extract_class_calls(call_graph_data):
             # Add edge between classes
             G.add_edge(source_class, target_class)
     
-    return G
+    # Anything still pending was never defined as a method, so has no class
+    
+    return _make_graph(G, backend)
 
 def create_interactive_graph(G, output_file, title):
     """
     Create an interactive HTML visualization of the graph.
     
     Args:
-        G: NetworkX graph
+        G: CallGraph, NetworkX graph or igraph graph
         output_file: Output HTML file path
         title: Graph title
     """
-    # Create a PyVis network
-    net = Network(notebook=False, height="800px", width="100%", directed=True)
+    # Create a PyVis network (remote resources inline PyVis's helper script,
+    # so the page doesn't depend on a lib/ directory next to it)
+    net = Network(notebook=False, height="800px", width="100%", directed=True, cdn_resources="remote")
     
-    # Add nodes and edges from NetworkX graph
-    for node, attrs in G.nodes(data=True):
+    # Add nodes and edges from the graph
+    for node, attrs in _graph_nodes(G):
         net.add_node(node, label=attrs.get('label', node), title=attrs.get('title', node), group=attrs.get('group', ''))
     
-    for source, target in G.edges():
+    for source, target in _graph_edges(G):
         net.add_edge(source, target)
     
     # Set options for better visualization
-    net.set_options("""
-    {
-        "nodes": {
-            "shape": "dot",
-            "size": 20,
-            "font": {
-                "size": 14,
-                "face": "Tahoma"
-            }
-        },
-        "edges": {
-            "color": {
-                "inherit": true
-            },
-            "smooth": {
-                "type": "continuous"
-            }
-        },
-        "physics": {
-            "barnesHut": {
-                "gravitationalConstant": -80000,
-                "centralGravity": 0.3,
-                "springLength": 95,
-                "springConstant": 0.04
-            },
-            "maxVelocity": 50,
-            "minVelocity": 0.1,
-            "solver": "barnesHut",
-            "stabilization": {
-                "enabled": true,
-                "iterations": 1000,
-                "updateInterval": 100
-            }
-        }
-    }
-    """)
+    net.options = PYVIS_OPTIONS
     
     # Add title to the HTML
     html_title = f"""
@@ -228,14 +474,9 @@ def create_interactive_graph(G, output_file, title):
     <p>Interactive call graph visualization. Drag nodes to rearrange. Zoom with mouse wheel. Click nodes to highlight connections.</p>
     """
     
-    # Save the graph to an HTML file
-    net.save_graph(output_file)
-    
-    # Add the title to the HTML file
-    with open(output_file, 'r') as f:
-        html_content = f.read()
-    
-    html_content = html_content.replace('<body>', f'<body>\n{html_title}')
+    # Render the graph to HTML and add the title in memory, then write once
+    html_content = net.generate_html(notebook=False)
+    html_content = html_content.replace('<body>', f'<body>\n{html_title}', 1)
     
     with open(output_file, 'w') as f:
         f.write(html_content)
@@ -367,13 +608,77 @@ def generate_index_html(function_graphs, class_graphs):
     
     return index_file
 
+class StructureCollector(ast.NodeVisitor):
+    """
+    Collect the classes, functions and direct function calls of a module in
+    a single traversal.
+    
+    Keeps a stack of the enclosing function definitions, so each call is
+    attributed to the innermost function it appears in. Calls are recorded
+    by name only; since a function may be called before it is defined,
+    edges() filters them down to the module's own functions afterwards.
+    """
+    
+    def __init__(self):
+        self.classes = []
+        self.functions = []
+        self.calls = []
+        self.stack = []
+    
+    def visit_ClassDef(self, node):
+        self.classes.append(node.name)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        self.functions.append(node.name)
+        self.stack.append(node.name)
+        self.generic_visit(node)
+        self.stack.pop()
+    
+    def visit_Call(self, node):
+        # A direct call by name, made from inside a function
+        if self.stack and isinstance(node.func, ast.Name):
+            self.calls.append((self.stack[-1], node.func.id))
+        self.generic_visit(node)
+    
+    def edges(self):
+        """
+        Return (caller, callee) pairs for calls to functions in the module.
+        """
+        functions = set(self.functions)
+        return [(caller, callee) for caller, callee in self.calls if callee in functions]
+
+def _analyze_one(python_file):
+    """
+    Parse a single Python file and collect its classes, functions and calls.
+    Runs in a worker process, so it only returns plain data.
+    
+    Args:
+        python_file: Path to the Python file
+    
+    Returns:
+        Tuple of (function names, class names, call edges)
+    """
+    with open(python_file, 'r', encoding='utf-8') as f:
+        code = f.read()
+    
+    # Parse the Python code
+    tree = ast.parse(code)
+    
+    # Extract classes, functions and the calls between functions
+    collector = StructureCollector()
+    collector.visit(tree)
+    
+    return collector.functions, collector.classes, collector.edges()
+
 def analyze_python_file_structure():
     """
     Analyze the structure of Python files to extract classes and functions.
     This is a fallback method if pycg doesn't work well.
-    """
-    import ast
     
+    Files are parsed in parallel worker processes; the graphs are then built
+    serially in this process.
+    """
     class_graphs = []
     function_graphs = []
     
@@ -381,57 +686,51 @@ def analyze_python_file_structure():
     combined_function_graph = nx.DiGraph()
     combined_class_graph = nx.DiGraph()
     
-    for python_file in python_files:
+    # Parse all files in parallel (at least one worker, even with no files)
+    max_workers = max(1, min(len(python_files), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_analyze_one, python_file) for python_file in python_files]
+    
+    for python_file, future in zip(python_files, futures):
         file_name = os.path.basename(python_file)
+        stem = file_name[:-3] if file_name.endswith('.py') else file_name
         print(f"Analyzing {file_name}...")
         
         try:
-            with open(python_file, 'r', encoding='utf-8') as f:
-                code = f.read()
-            
-            # Parse the Python code
-            tree = ast.parse(code)
+            functions, classes, edges = future.result()
             
-            # Extract classes and functions
-            classes = []
-            functions = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-            
-            # Create function-level graph
-            function_graph = nx.DiGraph()
+            # Add this file's functions, classes and call edges to the
+            # combined graphs
             for func in functions:
-                function_graph.add_node(func, label=func, title=f"{file_name}:{func}", group=file_name)
                 combined_function_graph.add_node(func, label=func, title=f"{file_name}:{func}", group=file_name)
             
-            # Create class-level graph
-            class_graph = nx.DiGraph()
             for cls in classes:
-                class_graph.add_node(cls, label=cls, title=f"{file_name}:{cls}", group=file_name)
                 combined_class_graph.add_node(cls, label=cls, title=f"{file_name}:{cls}", group=file_name)
             
-            # Try to infer relationships from code (this is a simplified approach)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    if hasattr(node.func, 'id') and node.func.id in functions:
-                        # This is a direct function call
-                        if hasattr(node, 'parent_func') and node.parent_func in functions:
-                            function_graph.add_edge(node.parent_func, node.func.id)
-                            combined_function_graph.add_edge(node.parent_func, node.func.id)
+            for caller, callee in edges:
+                combined_function_graph.add_edge(caller, callee)
+            
+            # The per-file graphs are views of the combined graphs restricted
+            # to this file's nodes and edges (rendered straight away, so no
+            # copy needed). Edges are filtered too: another file may define
+            # functions with the same names and calls between them.
+            file_edges = set(edges)
+            function_graph = nx.subgraph_view(
+                combined_function_graph,
+                filter_node=set(functions).__contains__,
+                filter_edge=lambda u, v: (u, v) in file_edges,
+            )
+            class_graph = combined_class_graph.subgraph(classes)
             
             # Save individual graphs
             if functions:
-                output_file = os.path.join(OUTPUT_DIR, f"{file_name.replace('.py', '')}_function.html")
+                output_file = os.path.join(OUTPUT_DIR, f"{stem}_function.html")
                 create_interactive_graph(function_graph, output_file, f"Function Call Graph: {file_name}")
                 function_graphs.append(output_file)
                 print(f"  Function call graph saved to {output_file}")
             
             if classes:
-                output_file = os.path.join(OUTPUT_DIR, f"{file_name.replace('.py', '')}_class.html")
+                output_file = os.path.join(OUTPUT_DIR, f"{stem}_class.html")
                 create_interactive_graph(class_graph, output_file, f"Class Call Graph: {file_name}")
                 class_graphs.append(output_file)
                 print(f"  Class call graph saved to {output_file}")